@@ -1,21 +1,101 @@
-from fastapi import FastAPI
-from openai_handler.openai_handler import OpenAIHandler
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from os import getenv
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from models.language import Language
 from models.summary_for_recap import SummaryForRecap
+from models.previous_recap import PreviousRecap
 from models.recap_type import RecapType
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from batch_jobs.batch_job_handler import BatchJobHandler
+    from openai_handler.openai_handler import OpenAIHandler
+
 
 load_dotenv()
 
-app = FastAPI(title="Summarizer API", version="0.1.0")
-handler = OpenAIHandler()
+logger = logging.getLogger(__name__)
+
+BACKGROUND_WARMUP = getenv("AIAPI_BACKGROUND_WARMUP", "true").lower() == "true"
+
+handler: "OpenAIHandler | None" = None
+_handler_task: asyncio.Task | None = None
+batch_job_handler: "BatchJobHandler | None" = None
+
+
+def _create_handler() -> "OpenAIHandler":
+    # LangChain and the OpenAI client are imported here instead of at module level
+    # so uvicorn can start answering /health before they are loaded.
+    from openai_handler.openai_handler import OpenAIHandler
+    from shared_state.shared_state import SharedState
+    return OpenAIHandler(shared_state=SharedState.from_env())
+
+
+def _log_warmup_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("OpenAI handler warm-up failed: %s", task.exception())
+
+
+def _start_warmup() -> asyncio.Task:
+    global _handler_task
+    if _handler_task is None:
+        _handler_task = asyncio.create_task(asyncio.to_thread(_create_handler))
+        _handler_task.add_done_callback(_log_warmup_failure)
+    return _handler_task
+
+
+async def _get_handler() -> "OpenAIHandler":
+    global handler, _handler_task
+    if handler is None:
+        try:
+            handler = await asyncio.shield(_start_warmup())
+        except Exception:
+            _handler_task = None
+            raise
+    return handler
+
+
+async def _get_batch_job_handler() -> "BatchJobHandler":
+    global batch_job_handler
+    if batch_job_handler is None:
+        from batch_jobs.batch_job_handler import BatchJobHandler
+        batch_job_handler = BatchJobHandler.from_env(await _get_handler())
+    return batch_job_handler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = _start_warmup()
+    if not BACKGROUND_WARMUP:
+        await warmup
+    yield
+
+
+app = FastAPI(title="Summarizer API", version="0.1.0", lifespan=lifespan)
 
 
 @app.get("/health")
 async def health_check() -> dict[str, str]:
-    return {"status": "ok"} 
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    global handler, _handler_task
+    if handler is None and _handler_task is not None and _handler_task.done():
+        if _handler_task.exception() is not None:
+            _handler_task = None
+            _start_warmup()
+            return JSONResponse({"status": "failed"}, status_code=503)
+        handler = _handler_task.result()
+    if handler is None:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return JSONResponse({"status": "ready"})
 
 class SummarizeRequest(BaseModel):
     title: str
@@ -25,15 +105,39 @@ class SummarizeRequest(BaseModel):
 @app.post("/summarize")
 async def summarize_article(request: SummarizeRequest) -> dict:
     lang_enum = Language(request.language)
-    summary_response = await handler.summarize_async(request.title, request.article, lang_enum)
+    summary_response = await (await _get_handler()).summarize_async(request.title, request.article, lang_enum)
     return summary_response.model_dump()
 
 class RecapRequest(BaseModel):
     summaries: list[SummaryForRecap]
     recap_type: str
+    previous_recaps: list[PreviousRecap] = []
 
 @app.post("/recap")
 async def recap_article(request: RecapRequest) -> dict:
     recap_type = RecapType(request.recap_type)
-    recap_response = await handler.recap_async(request.summaries, recap_type)
+    recap_response = await (await _get_handler()).recap_async(
+        request.summaries, recap_type, request.previous_recaps
+    )
     return recap_response.model_dump()
+
+class BatchSummarizeRequest(BaseModel):
+    articles: list[SummarizeRequest] = Field(min_length=1)
+
+@app.post("/batch/summarize")
+async def submit_batch_summarize(request: BatchSummarizeRequest) -> dict:
+    articles = [(article.title, article.article, Language(article.language)) for article in request.articles]
+    job = await (await _get_batch_job_handler()).submit_async(articles)
+    return job.model_dump(mode="json", exclude_none=True)
+
+@app.get("/batch/jobs")
+async def list_batch_jobs() -> list[dict]:
+    jobs = await (await _get_batch_job_handler()).list_jobs_async()
+    return [job.model_dump(mode="json", exclude_none=True) for job in jobs]
+
+@app.get("/batch/jobs/{job_id}")
+async def get_batch_job(job_id: str) -> dict:
+    job = await (await _get_batch_job_handler()).get_job_async(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job {job_id} not found")
+    return job.model_dump(mode="json")
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import tempfile
+import uuid
+from os import getenv
+
+from pydantic import ValidationError
+
+from batch_jobs.batch_job_store import BatchJobStore
+from batch_jobs.batch_provider import BATCH_ENDPOINT, TERMINAL_BATCH_STATUSES, BatchProvider
+from models.batch_job import BatchJob, BatchJobStatus
+from models.language import Language
+from openai_handler.openai_handler import OpenAIHandler
+from openai_handler.summary.summary_ai_response import SummaryAIResponse
+
+logger = logging.getLogger(__name__)
+
+# The Batch API accepts at most 50,000 requests and 200 MB per input file
+MAX_REQUESTS_PER_BATCH = 50_000
+MAX_BATCH_FILE_BYTES = 190 * 1024 * 1024
+
+
+class BatchJobHandler:
+    def __init__(self, openai_handler: OpenAIHandler, provider: BatchProvider, store: BatchJobStore, model_name: str):
+        self.openai_handler = openai_handler
+        self.provider = provider
+        self.store = store
+        self.model_name = model_name
+        self.summary_response_format = self._get_summary_response_format()
+
+    @classmethod
+    def from_env(cls, openai_handler: OpenAIHandler) -> "BatchJobHandler":
+        path = getenv("AIAPI_BATCH_JOBS_PATH", os.path.join(tempfile.gettempdir(), "aiapi-batch-jobs.sqlite3"))
+        provider_name = getenv("AIAPI_BATCH_PROVIDER", "openai").lower()
+        if provider_name == "stub":
+            from batch_jobs.stub_batch_provider import StubBatchProvider
+            provider = StubBatchProvider(path, completion_delay=float(getenv("AIAPI_STUB_BATCH_DELAY", "0")))
+        elif provider_name == "openai":
+            from batch_jobs.openai_batch_provider import OpenAIBatchProvider
+            provider = OpenAIBatchProvider()
+        else:
+            raise ValueError(f"Unknown batch provider: {provider_name}")
+        store = BatchJobStore(path)
+        return cls(openai_handler, provider, store, getenv("OPENAI_MODEL", "gpt-5-mini"))
+
+    def _get_summary_response_format(self) -> dict:
+        schema = SummaryAIResponse.model_json_schema()
+        schema["additionalProperties"] = False
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": SummaryAIResponse.__name__, "strict": True, "schema": schema},
+        }
+
+    def _get_request_line(self, custom_id: str, title: str, article: str, language: Language) -> str:
+        user_message = self.openai_handler._get_summary_user_message(language, title, article)
+        return json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": self.model_name,
+                "messages": [
+                    {"role": "system", "content": self.openai_handler.summary_system_message.content},
+                    {"role": "user", "content": user_message.content},
+                ],
+                "response_format": self.summary_response_format,
+            },
+        })
+
+    def _pack(self, lines: list[tuple[str, str]]) -> list[list[tuple[str, str]]]:
+        chunks: list[list[tuple[str, str]]] = [[]]
+        chunk_bytes = 0
+        for custom_id, line in lines:
+            line_bytes = len(line.encode()) + 1
+            if chunks[-1] and (
+                len(chunks[-1]) >= MAX_REQUESTS_PER_BATCH or chunk_bytes + line_bytes > MAX_BATCH_FILE_BYTES
+            ):
+                chunks.append([])
+                chunk_bytes = 0
+            chunks[-1].append((custom_id, line))
+            chunk_bytes += line_bytes
+        return chunks
+
+    async def submit_async(self, articles: list[tuple[str, str, Language]]) -> BatchJob:
+        """Submits one summary request per (title, article, language) and returns the new job."""
+        job_id = uuid.uuid4().hex
+        custom_ids = [f"{job_id}-{index}" for index in range(len(articles))]
+        await self.store.create_job_async(job_id, [
+            (custom_id, title) for custom_id, (title, _, _) in zip(custom_ids, articles)
+        ])
+        lines = [
+            (custom_id, self._get_request_line(custom_id, title, article, language))
+            for custom_id, (title, article, language) in zip(custom_ids, articles)
+        ]
+        for chunk in self._pack(lines):
+            if not chunk:
+                continue
+            try:
+                batch_id = await self.provider.submit_async("\n".join(line for _, line in chunk))
+            except Exception as e:
+                logger.exception("Failed to submit batch for job %s", job_id)
+                await self.store.fail_pending_items_async(job_id, f"Submitting batch failed: {e}")
+                break
+            await self.store.add_batch_async(job_id, batch_id, "validating", [custom_id for custom_id, _ in chunk])
+        await self.store.update_job_status_async(job_id)
+        return await self.store.get_job_async(job_id)
+
+    def _parse_result_line(self, line: str) -> tuple[str, SummaryAIResponse | None, str | None]:
+        data = json.loads(line)
+        custom_id = data["custom_id"]
+        response = data.get("response") or {}
+        if data.get("error") or response.get("status_code") != 200:
+            error = data.get("error") or response.get("body", {}).get("error") or {}
+            return custom_id, None, error.get("message", "Request failed")
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            summary = SummaryAIResponse.model_validate_json(content)
+        except (KeyError, IndexError, TypeError, ValidationError) as e:
+            return custom_id, None, f"Invalid summary response: {e}"
+        summary.tags = self.openai_handler._filter_tags(summary.tags)
+        return custom_id, summary, None
+
+    async def _refresh_job_async(self, job_id: str) -> None:
+        for batch_id in await self.store.get_pending_batch_ids_async(job_id, TERMINAL_BATCH_STATUSES):
+            batch = await self.provider.retrieve_async(batch_id)
+            if not batch.is_terminal:
+                continue
+            results = [
+                self._parse_result_line(line)
+                for content in (batch.output, batch.errors) if content
+                for line in content.splitlines() if line.strip()
+            ]
+            await self.store.set_results_async(results)
+            await self.store.fail_pending_items_async(job_id, f"Batch {batch.status} without a result", batch_id)
+            await self.store.finish_batch_async(job_id, batch_id, batch.status)
+
+    async def get_job_async(self, job_id: str, include_results: bool = True) -> BatchJob | None:
+        job = await self.store.get_job_async(job_id)
+        if job is None:
+            return None
+        if job.status == BatchJobStatus.InProgress:
+            await self._refresh_job_async(job_id)
+        return await self.store.get_job_async(job_id, include_results)
+
+    async def list_jobs_async(self) -> list[BatchJob]:
+        return [await self.get_job_async(job_id, include_results=False) for job_id in await self.store.list_job_ids_async()]
@@ -0,0 +1,205 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from models.batch_job import BatchJob, BatchJobItemStatus, BatchJobResult, BatchJobStatus
+from openai_handler.summary.summary_ai_response import SummaryAIResponse
+from shared_state.sqlite_connections import SqliteConnections
+
+
+class BatchJobStore:
+    """Persists batch jobs, the provider batches they were split into and their per-article results."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connections = SqliteConnections(path)
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._connections.get()
+
+    def _create_schema(self) -> None:
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS batch_job_batches (
+                provider_batch_id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                status TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS batch_job_batches_job_id ON batch_job_batches (job_id);
+            CREATE TABLE IF NOT EXISTS batch_job_items (
+                custom_id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                item_index INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                provider_batch_id TEXT,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS batch_job_items_job_id ON batch_job_items (job_id, item_index);
+        """)
+
+    def _create_job(self, job_id: str, items: list[tuple[str, str]]) -> None:
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute(
+                "INSERT INTO batch_jobs (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, BatchJobStatus.InProgress.value, now, now),
+            )
+            connection.executemany(
+                "INSERT INTO batch_job_items (custom_id, job_id, item_index, title, status) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (custom_id, job_id, index, title, BatchJobItemStatus.Pending.value)
+                    for index, (custom_id, title) in enumerate(items)
+                ],
+            )
+
+    def _add_batch(self, job_id: str, provider_batch_id: str, status: str, custom_ids: list[str]) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute(
+                "INSERT INTO batch_job_batches (provider_batch_id, job_id, status) VALUES (?, ?, ?)",
+                (provider_batch_id, job_id, status),
+            )
+            connection.executemany(
+                "UPDATE batch_job_items SET provider_batch_id = ? WHERE custom_id = ?",
+                [(provider_batch_id, custom_id) for custom_id in custom_ids],
+            )
+
+    def _get_pending_batch_ids(self, job_id: str, terminal_statuses: set[str]) -> list[str]:
+        rows = self._connection().execute(
+            "SELECT provider_batch_id, status FROM batch_job_batches WHERE job_id = ?", (job_id,)
+        ).fetchall()
+        return [batch_id for batch_id, status in rows if status not in terminal_statuses]
+
+    def _set_results(self, results: list[tuple[str, SummaryAIResponse | None, str | None]]) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "UPDATE batch_job_items SET status = ?, result = ?, error = ? WHERE custom_id = ?",
+                [
+                    (
+                        (BatchJobItemStatus.Succeeded if summary else BatchJobItemStatus.Failed).value,
+                        summary.model_dump_json() if summary else None,
+                        error,
+                        custom_id,
+                    )
+                    for custom_id, summary, error in results
+                ],
+            )
+
+    def _fail_pending_items(self, job_id: str, error: str, provider_batch_id: str | None = None) -> None:
+        query = "UPDATE batch_job_items SET status = ?, error = ? WHERE job_id = ? AND status = ?"
+        params: list = [BatchJobItemStatus.Failed.value, error, job_id, BatchJobItemStatus.Pending.value]
+        if provider_batch_id is None:
+            query += " AND provider_batch_id IS NULL"
+        else:
+            query += " AND provider_batch_id = ?"
+            params.append(provider_batch_id)
+        self._connection().execute(query, params)
+
+    def _finish_batch(self, job_id: str, provider_batch_id: str, status: str) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute(
+                "UPDATE batch_job_batches SET status = ? WHERE provider_batch_id = ?", (status, provider_batch_id)
+            )
+        self._update_job_status(job_id)
+
+    def _update_job_status(self, job_id: str) -> None:
+        connection = self._connection()
+        counts = dict(connection.execute(
+            "SELECT status, COUNT(*) FROM batch_job_items WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        if counts.get(BatchJobItemStatus.Pending.value):
+            status = BatchJobStatus.InProgress
+        elif counts.get(BatchJobItemStatus.Succeeded.value):
+            status = BatchJobStatus.Completed
+        else:
+            status = BatchJobStatus.Failed
+        connection.execute(
+            "UPDATE batch_jobs SET status = ?, updated_at = ? WHERE id = ?", (status.value, time.time(), job_id)
+        )
+
+    def _to_iso(self, timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+    def _get_job(self, job_id: str, include_results: bool) -> BatchJob | None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT id, status, created_at, updated_at FROM batch_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        counts = dict(connection.execute(
+            "SELECT status, COUNT(*) FROM batch_job_items WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        job = BatchJob(
+            id=row[0],
+            status=BatchJobStatus(row[1]),
+            created=self._to_iso(row[2]),
+            updated=self._to_iso(row[3]),
+            total=sum(counts.values()),
+            succeeded=counts.get(BatchJobItemStatus.Succeeded.value, 0),
+            failed=counts.get(BatchJobItemStatus.Failed.value, 0),
+        )
+        if include_results:
+            job.results = [
+                BatchJobResult(
+                    index=index,
+                    title=title,
+                    status=BatchJobItemStatus(status),
+                    summary=SummaryAIResponse.model_validate_json(result) if result else None,
+                    error=error,
+                )
+                for index, title, status, result, error in connection.execute(
+                    "SELECT item_index, title, status, result, error FROM batch_job_items "
+                    "WHERE job_id = ? ORDER BY item_index",
+                    (job_id,),
+                )
+            ]
+        return job
+
+    def _list_job_ids(self) -> list[str]:
+        return [row[0] for row in self._connection().execute("SELECT id FROM batch_jobs ORDER BY created_at DESC")]
+
+    async def create_job_async(self, job_id: str, items: list[tuple[str, str]]) -> None:
+        """Creates a job with one pending item per (custom ID, title) pair."""
+        await asyncio.to_thread(self._create_job, job_id, items)
+
+    async def add_batch_async(self, job_id: str, provider_batch_id: str, status: str, custom_ids: list[str]) -> None:
+        await asyncio.to_thread(self._add_batch, job_id, provider_batch_id, status, custom_ids)
+
+    async def get_pending_batch_ids_async(self, job_id: str, terminal_statuses: set[str]) -> list[str]:
+        return await asyncio.to_thread(self._get_pending_batch_ids, job_id, terminal_statuses)
+
+    async def set_results_async(self, results: list[tuple[str, SummaryAIResponse | None, str | None]]) -> None:
+        await asyncio.to_thread(self._set_results, results)
+
+    async def fail_pending_items_async(self, job_id: str, error: str, provider_batch_id: str | None = None) -> None:
+        """Fails pending items of a provider batch, or items not submitted in any batch if none is given."""
+        await asyncio.to_thread(self._fail_pending_items, job_id, error, provider_batch_id)
+
+    async def finish_batch_async(self, job_id: str, provider_batch_id: str, status: str) -> None:
+        await asyncio.to_thread(self._finish_batch, job_id, provider_batch_id, status)
+
+    async def update_job_status_async(self, job_id: str) -> None:
+        await asyncio.to_thread(self._update_job_status, job_id)
+
+    async def get_job_async(self, job_id: str, include_results: bool = False) -> BatchJob | None:
+        return await asyncio.to_thread(self._get_job, job_id, include_results)
+
+    async def list_job_ids_async(self) -> list[str]:
+        return await asyncio.to_thread(self._list_job_ids)
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class ProviderBatch:
+    id: str
+    status: str
+    output: str | None = None
+    errors: str | None = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_BATCH_STATUSES
+
+
+class BatchProvider(ABC):
+    """Submits Batch-API JSONL files and reports their state and results."""
+
+    @abstractmethod
+    async def submit_async(self, jsonl: str) -> str:
+        """Uploads the JSONL requests and starts a batch, returning the provider batch ID."""
+
+    @abstractmethod
+    async def retrieve_async(self, batch_id: str) -> ProviderBatch:
+        """Returns the batch state, including the output and error JSONL once it is terminal."""
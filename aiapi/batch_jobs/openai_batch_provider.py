@@ -0,0 +1,35 @@
+from os import getenv
+
+from openai import AsyncOpenAI
+
+from batch_jobs.batch_provider import BATCH_ENDPOINT, BatchProvider, ProviderBatch
+
+
+class OpenAIBatchProvider(BatchProvider):
+    def __init__(self):
+        self.client = AsyncOpenAI(project=getenv("OPENAI_PROJECT"))
+
+    async def submit_async(self, jsonl: str) -> str:
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", jsonl.encode()),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def _read_file_async(self, file_id: str | None) -> str | None:
+        if not file_id:
+            return None
+        return (await self.client.files.content(file_id)).text
+
+    async def retrieve_async(self, batch_id: str) -> ProviderBatch:
+        batch = await self.client.batches.retrieve(batch_id)
+        provider_batch = ProviderBatch(id=batch.id, status=batch.status)
+        if provider_batch.is_terminal:
+            provider_batch.output = await self._read_file_async(batch.output_file_id)
+            provider_batch.errors = await self._read_file_async(batch.error_file_id)
+        return provider_batch
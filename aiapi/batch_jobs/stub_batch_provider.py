@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+
+from batch_jobs.batch_provider import BatchProvider, ProviderBatch
+from shared_state.sqlite_connections import SqliteConnections
+
+logger = logging.getLogger(__name__)
+
+
+class StubBatchProvider(BatchProvider):
+    """Offline stand-in for the OpenAI Batch API.
+
+    Batches complete `completion_delay` seconds after submission with a valid
+    SummaryAIResponse for every request. Requests whose user message contains
+    `fail_marker` get an error line instead, to exercise partial failures.
+    Submitted batches are stored in the SQLite database at `path`, so they
+    survive restarts and are visible to every worker sharing that file.
+    """
+
+    def __init__(self, path: str, completion_delay: float = 0, fail_marker: str = "STUB_BATCH_FAIL"):
+        self.path = path
+        self.completion_delay = completion_delay
+        self.fail_marker = fail_marker
+        self._connections = SqliteConnections(path)
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS stub_batches (
+                id TEXT PRIMARY KEY,
+                submitted_at REAL NOT NULL,
+                requests TEXT NOT NULL
+            )
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._connections.get()
+
+    def _insert_batch(self, batch_id: str, jsonl: str) -> None:
+        self._connection().execute(
+            "INSERT INTO stub_batches (id, submitted_at, requests) VALUES (?, ?, ?)", (batch_id, time.time(), jsonl)
+        )
+
+    def _get_batch(self, batch_id: str) -> tuple[float, str] | None:
+        return self._connection().execute(
+            "SELECT submitted_at, requests FROM stub_batches WHERE id = ?", (batch_id,)
+        ).fetchone()
+
+    async def submit_async(self, jsonl: str) -> str:
+        batch_id = f"batch_stub_{uuid.uuid4().hex}"
+        await asyncio.to_thread(self._insert_batch, batch_id, jsonl)
+        return batch_id
+
+    async def retrieve_async(self, batch_id: str) -> ProviderBatch:
+        row = await asyncio.to_thread(self._get_batch, batch_id)
+        if row is None:
+            # Not a terminal status, so jobs are not failed when the stub database was swapped out
+            logger.warning("Unknown stub batch %s", batch_id)
+            return ProviderBatch(id=batch_id, status="in_progress")
+        submitted_at, jsonl = row
+        if time.time() - submitted_at < self.completion_delay:
+            return ProviderBatch(id=batch_id, status="in_progress")
+        requests = [json.loads(line) for line in jsonl.splitlines() if line.strip()]
+        output, errors = [], []
+        for request in requests:
+            user_message = request["body"]["messages"][-1]["content"]
+            if self.fail_marker in user_message:
+                errors.append(self._error_line(request))
+            else:
+                output.append(self._output_line(request))
+        return ProviderBatch(
+            id=batch_id,
+            status="completed",
+            output="\n".join(output) or None,
+            errors="\n".join(errors) or None,
+        )
+
+    def _output_line(self, request: dict) -> str:
+        content = {
+            "summary_english": "Stub summary in English.",
+            "summary_german": "Stub-Zusammenfassung auf Deutsch.",
+            "title_translated": "Stub title",
+            "tags": ["Ransomware", "not-a-real-tag"],
+        }
+        body = {
+            "object": "chat.completion",
+            "model": request["body"]["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(content)},
+            }],
+        }
+        return json.dumps({
+            "id": f"batch_req_{uuid.uuid4().hex}",
+            "custom_id": request["custom_id"],
+            "response": {"status_code": 200, "body": body},
+            "error": None,
+        })
+
+    def _error_line(self, request: dict) -> str:
+        return json.dumps({
+            "id": f"batch_req_{uuid.uuid4().hex}",
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 400,
+                "body": {"error": {"message": "Stub failure", "type": "invalid_request_error"}},
+            },
+            "error": None,
+        })
@@ -0,0 +1,105 @@
+import asyncio
+import re
+import time
+from typing import Any, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+SUMMARY_TOOL_NAME = "SummaryAIResponse"
+RECAP_TOOL_NAME = "RecapAIResponse"
+
+_ID_PATTERN = re.compile(r"^ID: (\d+)$", re.MULTILINE)
+_FILLER_WORD = "lorem"
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic stand-in for ChatOpenAI used to benchmark aiapi offline.
+
+    The model never calls out to the network. It answers every request with a
+    tool call for the structured output tool the agent bound, after sleeping
+    for `latency` seconds to simulate the provider round trip.
+    """
+
+    latency: float = 0.0
+    output_words: int = 60
+    recap_sections: int = 3
+    tags: list[str] = ["Ransomware", "Vulnerability", "Phishing", "not-a-real-tag"]
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat-model"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._build_result(messages, kwargs.get("tools") or [])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._build_result(messages, kwargs.get("tools") or [])
+
+    def _build_result(self, messages: list[BaseMessage], tools: list[dict]) -> ChatResult:
+        tool_names = {tool["function"]["name"] for tool in tools}
+        if SUMMARY_TOOL_NAME in tool_names:
+            name, args = SUMMARY_TOOL_NAME, self._summary_args()
+        elif RECAP_TOOL_NAME in tool_names:
+            name, args = RECAP_TOOL_NAME, self._recap_args(messages)
+        else:
+            raise ValueError(f"No supported structured output tool bound, got {sorted(tool_names)}")
+        input_tokens = sum(len(str(message.content).split()) for message in messages)
+        output_tokens = self._count_words(args)
+        message = AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": args, "id": f"call_{len(messages)}", "type": "tool_call"}],
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _text(self, words: int) -> str:
+        return " ".join([_FILLER_WORD] * max(words, 1))
+
+    def _summary_args(self) -> dict:
+        return {
+            "summary_english": self._text(self.output_words),
+            "summary_german": self._text(self.output_words),
+            "title_translated": self._text(8),
+            "tags": list(self.tags),
+        }
+
+    def _recap_args(self, messages: list[BaseMessage]) -> dict:
+        ids = [
+            int(match)
+            for message in messages if isinstance(message, HumanMessage)
+            for match in _ID_PATTERN.findall(str(message.content))
+        ]
+        words_per_section = max(self.output_words // max(self.recap_sections, 1), 1)
+        sections = [
+            {
+                "heading": self._text(4),
+                "recap": self._text(words_per_section),
+                "related": ids[index::self.recap_sections][:5],
+            }
+            for index in range(self.recap_sections)
+        ]
+        return {"recap_sections_english": sections, "recap_sections_german": sections}
+
+    def _count_words(self, value: Any) -> int:
+        if isinstance(value, str):
+            return len(value.split())
+        if isinstance(value, dict):
+            return sum(self._count_words(v) for v in value.values())
+        if isinstance(value, list):
+            return sum(self._count_words(v) for v in value)
+        return 1
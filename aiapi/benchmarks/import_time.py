@@ -0,0 +1,79 @@
+"""Import-time profile for the Summarizer API.
+
+Runs `python -X importtime` in a fresh interpreter for each target module and
+reports the total import time plus the slowest modules. `api` is what uvicorn
+has to load before it can answer /health; `openai_handler.openai_handler` is
+loaded by the background warm-up.
+
+Run from the aiapi directory:
+
+    python -m benchmarks.import_time --output import_time.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+DEFAULT_TARGETS = ["api", "openai_handler.openai_handler"]
+
+
+def _parse_importtime(stderr: str) -> list[dict]:
+    # Lines look like: "import time:       123 |       4567 |   package.module"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def profile(target: str, top: int) -> dict:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{completed.stderr}")
+    modules = _parse_importtime(completed.stderr)
+    return {
+        "target": target,
+        "wall_ms": wall_ms,
+        "import_ms": sum(module["self_ms"] for module in modules),
+        "module_count": len(modules),
+        "slowest": sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:top],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time profile for the Summarizer API")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="Modules to import")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = [profile(target, args.top) for target in args.targets]
+    for result in results:
+        print(
+            f"{result['target']}: {result['import_ms']:.1f}ms importing "
+            f"{result['module_count']} modules ({result['wall_ms']:.1f}ms wall)"
+        )
+        for module in result["slowest"]:
+            print(f"  {module['cumulative_ms']:9.1f}ms  {module['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
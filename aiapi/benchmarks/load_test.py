@@ -0,0 +1,232 @@
+"""Offline load test for the Summarizer API.
+
+Drives /summarize and /recap in-process against a deterministic fake chat
+model and reports per-request framework overhead (CPU time), queueing delay,
+throughput, latency percentiles and memory usage at increasing concurrency.
+
+Run from the aiapi directory:
+
+    python -m benchmarks.load_test --concurrency 1 4 16 64 --model-latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
+os.environ.setdefault("LANGSMITH_TRACING", "false")
+
+import api
+from benchmarks.fake_chat_model import FakeChatModel
+from openai_handler.openai_handler import OpenAIHandler
+
+
+@dataclass
+class LevelResult:
+    endpoint: str
+    concurrency: int
+    requests: int
+    errors: int
+    throughput_rps: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    cpu_per_request_ms: float
+    queueing_mean_ms: float
+    max_rss_mb: float
+    traced_peak_mb: float | None
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _summarize_payload(article_words: int) -> dict:
+    return {
+        "title": "Benchmark article",
+        "article": " ".join(["word"] * article_words),
+        "language": "En",
+    }
+
+
+def _recap_payload(summary_count: int, previous_recap_count: int) -> dict:
+    payload = {
+        "summaries": [
+            {"title": f"Benchmark gist {i}", "summary": "A short benchmark summary.", "id": i}
+            for i in range(summary_count)
+        ],
+        "recap_type": "Weekly" if previous_recap_count else "Daily",
+    }
+    if previous_recap_count:
+        # Previous recaps cover all but the newest day of summaries
+        sections = [
+            {"heading": "Benchmark section", "recap": "A short benchmark recap.", "related": [i]}
+            for i in range(3)
+        ]
+        # Daily recaps of the past days, all inside the weekly timeframe
+        now = datetime.now(timezone.utc)
+        payload["previous_recaps"] = [
+            {
+                "recap_sections_english": sections,
+                "covered_from": (now - timedelta(days=day % 6 + 2, hours=-1)).isoformat(),
+                "covered_until": (now - timedelta(days=day % 6 + 1, hours=-1)).isoformat(),
+                "last_summary_id": summary_count - summary_count // 7,
+            }
+            for day in range(previous_recap_count)
+        ]
+    return payload
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    payload: dict,
+    concurrency: int,
+    total_requests: int,
+    model_latency: float,
+    trace_malloc: bool,
+) -> LevelResult:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total_requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.post(endpoint, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    if trace_malloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    # The app and the client share this process, so CPU time is the work done per request
+    # regardless of how long requests waited for the event loop
+    cpu_per_request = (time.process_time() - cpu_started) / len(latencies) if latencies else 0.0
+    traced_peak = None
+    if trace_malloc:
+        traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    return LevelResult(
+        endpoint=endpoint,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        throughput_rps=len(latencies) / elapsed if elapsed else 0.0,
+        latency_p50_ms=_percentile(latencies, 50) * 1000,
+        latency_p99_ms=_percentile(latencies, 99) * 1000,
+        cpu_per_request_ms=cpu_per_request * 1000,
+        queueing_mean_ms=(
+            max(statistics.fmean(latencies) - model_latency - cpu_per_request, 0.0) * 1000 if latencies else 0.0
+        ),
+        max_rss_mb=_max_rss_mb(),
+        traced_peak_mb=traced_peak,
+    )
+
+
+def _print_result(result: LevelResult) -> None:
+    print(
+        f"{result.endpoint:<11} c={result.concurrency:<4} n={result.requests:<5} "
+        f"err={result.errors:<3} {result.throughput_rps:9.1f} req/s  "
+        f"p50={result.latency_p50_ms:8.2f}ms  p99={result.latency_p99_ms:8.2f}ms  "
+        f"cpu/req={result.cpu_per_request_ms:7.2f}ms  queueing={result.queueing_mean_ms:8.2f}ms  rss={result.max_rss_mb:7.1f}MB"
+        + (f"  traced_peak={result.traced_peak_mb:6.1f}MB" if result.traced_peak_mb is not None else "")
+    )
+
+
+async def run(args: argparse.Namespace) -> list[LevelResult]:
+    model = FakeChatModel(
+        latency=args.model_latency,
+        output_words=args.output_words,
+        recap_sections=args.recap_sections,
+    )
+    api.handler = OpenAIHandler(model=model)
+
+    endpoints = {
+        "/summarize": _summarize_payload(args.article_words),
+        "/recap": _recap_payload(args.recap_summaries, args.previous_recaps),
+    }
+    results: list[LevelResult] = []
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://aiapi", timeout=None) as client:
+        for endpoint in args.endpoints:
+            payload = endpoints[endpoint]
+            # Warm up once so lazy initialisation does not skew the first level
+            await client.post(endpoint, json=payload)
+            for concurrency in args.concurrency:
+                result = await _run_level(
+                    client,
+                    endpoint,
+                    payload,
+                    concurrency,
+                    max(args.requests, concurrency),
+                    args.model_latency,
+                    args.trace_malloc,
+                )
+                _print_result(result)
+                results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test for the Summarizer API")
+    parser.add_argument(
+        "--endpoints", nargs="+", default=["/summarize", "/recap"], choices=["/summarize", "/recap"],
+        help="Endpoints to benchmark",
+    )
+    parser.add_argument(
+        "--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16, 32, 64],
+        help="Concurrency levels to run, in order",
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Simulated model latency in seconds")
+    parser.add_argument("--output-words", type=int, default=60, help="Words generated per summary or recap")
+    parser.add_argument("--recap-sections", type=int, default=3, help="Sections generated per recap")
+    parser.add_argument("--article-words", type=int, default=800, help="Words per article sent to /summarize")
+    parser.add_argument("--recap-summaries", type=int, default=50, help="Summaries sent per /recap request")
+    parser.add_argument(
+        "--previous-recaps",
+        type=int,
+        default=0,
+        help="Previous recaps sent per /recap request to benchmark incremental recaps",
+    )
+    parser.add_argument(
+        "--trace-malloc",
+        action="store_true",
+        help="Record the Python heap peak per level (slows down the run)",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,12 @@ def main() -> None:
         action="store_true",
         help="Enable auto-reload when running the dev server",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(getenv("AIAPI_WORKERS", "1")),
+        help="Number of worker processes; LLM limits and the summary cache are shared between them",
+    )
     args = parser.parse_args()
 
     uvicorn.run(
@@ -21,6 +27,7 @@ def main() -> None:
         host=args.host,
         port=args.port,
         reload=args.reload,
+        workers=None if args.reload else args.workers,
     )
 
 
@@ -0,0 +1,36 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+from openai_handler.summary.summary_ai_response import SummaryAIResponse
+
+
+class BatchJobStatus(Enum):
+    InProgress = "InProgress"
+    Completed = "Completed"
+    Failed = "Failed"
+
+
+class BatchJobItemStatus(Enum):
+    Pending = "Pending"
+    Succeeded = "Succeeded"
+    Failed = "Failed"
+
+
+class BatchJobResult(BaseModel):
+    index: int
+    title: str
+    status: BatchJobItemStatus
+    summary: SummaryAIResponse | None = None
+    error: str | None = None
+
+
+class BatchJob(BaseModel):
+    id: str
+    status: BatchJobStatus
+    created: str
+    updated: str
+    total: int
+    succeeded: int
+    failed: int
+    results: list[BatchJobResult] | None = None
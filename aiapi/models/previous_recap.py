@@ -0,0 +1,15 @@
+from pydantic import AwareDatetime, BaseModel, Field
+
+from openai_handler.recap.recap_ai_response import RecapSection
+
+
+class PreviousRecap(BaseModel):
+    recap_sections_english: list[RecapSection]
+    covered_from: AwareDatetime = Field(
+        description="Start of the timeframe this recap covers; recaps starting before the new timeframe are ignored",
+    )
+    covered_until: AwareDatetime = Field(description="End of the timeframe this recap covers")
+    last_summary_id: int | None = Field(
+        default=None,
+        description="Highest summary ID already covered by this recap; only newer summaries are recapped",
+    )
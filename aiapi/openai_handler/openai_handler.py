@@ -1,7 +1,8 @@
+import hashlib
 import json
 import logging
 import os
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from typing import List
 from os import getenv
 from datetime import datetime, timedelta, timezone
@@ -27,6 +28,7 @@ os.environ["LANGSMITH_TRACING_SAMPLING_RATE"] = getenv("LANGSMITH_TRACING_SAMPLI
 
 from langchain.agents import create_agent
 from langchain_openai.chat_models import ChatOpenAI
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.prompts import SystemMessagePromptTemplate, HumanMessagePromptTemplate
 
@@ -35,26 +37,48 @@ from openai_handler.summary.summary_ai_response import SummaryAIResponse
 
 from models.recap_type import RecapType
 from models.summary_for_recap import SummaryForRecap
-from openai_handler.recap.recap_ai_response import RecapAIResponse
+from models.previous_recap import PreviousRecap
+from openai_handler.recap.recap_ai_response import RecapAIResponse, RecapSection
+from shared_state.shared_state import SharedState
 
 class OpenAIHandler:
-    def __init__(self):
+    def __init__(self, model: BaseChatModel | None = None, shared_state: SharedState | None = None):
+        self.shared_state = shared_state
         self.tags = self._load_tags()
-        self.summary_user_message_template = self._load_summary_user_message_template()
-        openai_project = getenv("OPENAI_PROJECT")
-        project_headers = {"OpenAI-Project": openai_project} if openai_project else None
-        self.model = ChatOpenAI(
-            model=getenv("OPENAI_MODEL", "gpt-5-mini"),
-            default_headers=project_headers,
+        self.summary_user_prompt = HumanMessagePromptTemplate.from_template(
+            self._load_summary_user_message_template()
         )
+        self.model = model if model is not None else self._create_openai_model()
+        self.summary_system_message = self._load_summary_system_message()
         self.summary_agent = create_agent(
             model=self.model,
             response_format=SummaryAIResponse,
-            system_prompt=self._load_summary_system_message(),
+            system_prompt=self.summary_system_message,
+        )
+        # The recap system prompt contains the current timeframe, so it is sent with
+        # every request instead of being baked into the agent.
+        self.recap_agent = create_agent(
+            model=self.model,
+            response_format=RecapAIResponse,
+        )
+        self.recap_system_prompt = SystemMessagePromptTemplate.from_template(
+            self._load_recap_system_message_template()
+        )
+        self.recap_user_prompt = HumanMessagePromptTemplate.from_template(
+            self._load_recap_user_message_template()
+        )
+        self.recap_incremental_system_message = self._load_recap_incremental_system_message()
+        self.recap_previous_section_prompt = HumanMessagePromptTemplate.from_template(
+            self._load_recap_previous_section_template()
         )
-        self.recap_system_message_template = self._load_recap_system_message_template()
-        self.recap_user_message_template = self._load_recap_user_message_template()
 
+    def _create_openai_model(self) -> ChatOpenAI:
+        openai_project = getenv("OPENAI_PROJECT")
+        project_headers = {"OpenAI-Project": openai_project} if openai_project else None
+        return ChatOpenAI(
+            model=getenv("OPENAI_MODEL", "gpt-5-mini"),
+            default_headers=project_headers,
+        )
 
     def _load_tags(self) -> List[str]:
         with open("openai_handler/summary/tags.json") as f:
@@ -71,7 +95,7 @@ class OpenAIHandler:
             return f.read()
 
     def _get_summary_user_message(self, language: Language, title: str, article: str) -> HumanMessage:
-        return HumanMessagePromptTemplate.from_template(self.summary_user_message_template).format(
+        return self.summary_user_prompt.format(
             original_language=language.value,
             translation_language=language.invert().value,
             title=title,
@@ -84,27 +108,39 @@ class OpenAIHandler:
             if type(tag) is str and tag.lower().strip() in self.tags
         ]
     
-    async def summarize_async(self, title: str, article: str, language: Language) -> SummaryAIResponse:
-        messages = {"messages": [self._get_summary_user_message(language, title, article)]}
-        try:
-            result: dict = await self.summary_agent.ainvoke(messages)
-        except Exception as e:
-            if "LangSmith" in type(e).__module__ or "langsmith" in str(e).lower() or "rate limit" in str(e).lower():
-                logger.warning("LangSmith tracing error, retrying without tracing: %s", e)
-                with _disable_tracing():
-                    result = await self.summary_agent.ainvoke(messages)
-            else:
+    def _llm_slot(self):
+        return self.shared_state.llm_slot() if self.shared_state else nullcontext()
+
+    async def _invoke_agent(self, agent, messages: dict) -> dict:
+        async with self._llm_slot():
+            try:
+                return await agent.ainvoke(messages)
+            except Exception as e:
+                if "LangSmith" in type(e).__module__ or "langsmith" in str(e).lower() or "rate limit" in str(e).lower():
+                    logger.warning("LangSmith tracing error, retrying without tracing: %s", e)
+                    with _disable_tracing():
+                        return await agent.ainvoke(messages)
                 raise
+
+    def _get_summary_cache_key(self, user_message: HumanMessage) -> str:
+        model_name = getattr(self.model, "model_name", type(self.model).__name__)
+        payload = json.dumps([model_name, self.summary_system_message.content, user_message.content])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def summarize_async(self, title: str, article: str, language: Language) -> SummaryAIResponse:
+        user_message = self._get_summary_user_message(language, title, article)
+        cache_key = self._get_summary_cache_key(user_message)
+        if self.shared_state and (cached := await self.shared_state.get_cached_summary(cache_key)):
+            return SummaryAIResponse.model_validate_json(cached)
+        result = await self._invoke_agent(self.summary_agent, {"messages": [user_message]})
         response = result.get("structured_response")
         if response is None:
             raise ValueError("No structured response from summary agent")
         response.tags = self._filter_tags(response.tags)
+        if self.shared_state:
+            await self.shared_state.set_cached_summary(cache_key, response.model_dump_json())
         return response
     
-    def _load_recap_system_message(self) -> SystemMessage:
-        with open("openai_handler/recap/system.txt") as f:
-            return SystemMessagePromptTemplate.from_template(f.read()).format()
-        
     def _load_recap_system_message_template(self) -> str:
         with open("openai_handler/recap/system.txt") as f:
             return f.read()
@@ -113,48 +149,79 @@ class OpenAIHandler:
         with open("openai_handler/recap/user.txt") as f:
             return f.read()
         
-    def _get_recap_system_prompt(self, recap_type: RecapType) -> SystemMessage:
+    def _load_recap_incremental_system_message(self) -> str:
+        with open("openai_handler/recap/incremental_system.txt") as f:
+            return f.read()
+
+    def _load_recap_previous_section_template(self) -> str:
+        with open("openai_handler/recap/previous.txt") as f:
+            return f.read()
+
+    def _get_recap_timeframe(self, recap_type: RecapType) -> tuple[datetime, datetime]:
+        to_time = datetime.now(timezone.utc)
+        return to_time - timedelta(days=1 if recap_type == RecapType.Daily else 7), to_time
+
+    def _get_recap_system_prompt(
+        self, recap_type: RecapType, from_time: datetime, to_time: datetime, incremental: bool = False
+    ) -> SystemMessage:
         timeframe_desc = "24 hours" if recap_type == RecapType.Daily else "7 days"
-        from_time = (datetime.now(timezone.utc) - (
-            timedelta(days=1 if recap_type == RecapType.Daily else 7)
-        )).isoformat()
-        to_time = datetime.now(timezone.utc).isoformat()
-        return SystemMessagePromptTemplate.from_template(
-            self.recap_system_message_template
-        ).format(
+        system_message = self.recap_system_prompt.format(
             timeframe_desc=timeframe_desc,
-            from_time=from_time,
-            to_time=to_time
+            from_time=from_time.isoformat(),
+            to_time=to_time.isoformat()
         )
+        if incremental:
+            system_message.content += "\n\n" + self.recap_incremental_system_message
+        return system_message
     
-    def _get_recap_agent(self, recap_type: RecapType):
-        return create_agent(
-            model=self.model,
-            response_format=RecapAIResponse,
-            system_prompt=self._get_recap_system_prompt(recap_type),
-        )
-
     def _get_recap_user_message(self, summary: SummaryForRecap) -> HumanMessage:
-        return HumanMessagePromptTemplate.from_template(
-            self.recap_user_message_template
-        ).format(
+        return self.recap_user_prompt.format(
             title=summary.title,
             summary=summary.summary,
             id=summary.id
         )
     
-    async def recap_async(self, summaries: list[SummaryForRecap], recap_type: RecapType) -> RecapAIResponse:
-        agent = self._get_recap_agent(recap_type)
-        messages = {"messages": [self._get_recap_user_message(summary) for summary in summaries]}
-        try:
-            result: dict = await agent.ainvoke(messages)
-        except Exception as e:
-            if "LangSmith" in type(e).__module__ or "langsmith" in str(e).lower() or "rate limit" in str(e).lower():
-                logger.warning("LangSmith tracing error, retrying without tracing: %s", e)
-                with _disable_tracing():
-                    result = await agent.ainvoke(messages)
-            else:
-                raise
+    def _get_recap_previous_section_message(self, recap: PreviousRecap, section: RecapSection) -> HumanMessage:
+        return self.recap_previous_section_prompt.format(
+            heading=section.heading,
+            covered_from=recap.covered_from.isoformat(),
+            covered_until=recap.covered_until.isoformat(),
+            recap=section.recap,
+            related=", ".join(str(gist_id) for gist_id in section.related)
+        )
+
+    def _get_new_summaries(
+        self, summaries: list[SummaryForRecap], previous_recaps: list[PreviousRecap]
+    ) -> list[SummaryForRecap]:
+        covered_ids = [recap.last_summary_id for recap in previous_recaps if recap.last_summary_id is not None]
+        if not covered_ids:
+            return summaries
+        last_covered_id = max(covered_ids)
+        return [summary for summary in summaries if summary.id > last_covered_id]
+
+    async def recap_async(
+        self,
+        summaries: list[SummaryForRecap],
+        recap_type: RecapType,
+        previous_recaps: list[PreviousRecap] | None = None,
+    ) -> RecapAIResponse:
+        from_time, to_time = self._get_recap_timeframe(recap_type)
+        # Recaps reaching back before the timeframe would carry expired news into every later recap,
+        # so their summaries are recapped again instead
+        previous_recaps = [recap for recap in previous_recaps or [] if recap.covered_from >= from_time]
+        messages = {"messages": [
+            self._get_recap_system_prompt(recap_type, from_time, to_time, incremental=bool(previous_recaps)),
+            *(
+                self._get_recap_previous_section_message(recap, section)
+                for recap in previous_recaps
+                for section in recap.recap_sections_english
+            ),
+            *(
+                self._get_recap_user_message(summary)
+                for summary in self._get_new_summaries(summaries, previous_recaps)
+            ),
+        ]}
+        result = await self._invoke_agent(self.recap_agent, messages)
         response = result.get("structured_response")
         if response is None:
             raise ValueError("No structured response from recap agent")
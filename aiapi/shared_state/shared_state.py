@@ -0,0 +1,175 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from os import getenv
+from typing import AsyncIterator
+
+from shared_state.sqlite_connections import SqliteConnections
+
+
+RATE_WINDOW_SECONDS = 60.0
+POLL_INTERVAL_SECONDS = 0.05
+MAX_POLL_INTERVAL_SECONDS = 1.0
+
+
+class SharedState:
+    """LLM concurrency/rate budget and summary cache shared by all API workers.
+
+    State lives in a local SQLite database, so every uvicorn worker process that
+    points at the same file draws from the same budget and sees the same cache.
+    A limit or TTL of 0 disables the respective feature.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_concurrent_llm_calls: int = 0,
+        llm_requests_per_minute: int = 0,
+        summary_cache_ttl: float = 0,
+        llm_slot_lease: float = 600,
+    ):
+        self.path = path
+        self.max_concurrent_llm_calls = max_concurrent_llm_calls
+        self.llm_requests_per_minute = llm_requests_per_minute
+        self.summary_cache_ttl = summary_cache_ttl
+        self.llm_slot_lease = llm_slot_lease
+        self._connections = SqliteConnections(path)
+        self._create_schema()
+
+    @classmethod
+    def from_env(cls) -> "SharedState":
+        return cls(
+            path=getenv(
+                "AIAPI_SHARED_STATE_PATH",
+                os.path.join(tempfile.gettempdir(), "aiapi-shared-state.sqlite3"),
+            ),
+            max_concurrent_llm_calls=int(getenv("AIAPI_MAX_CONCURRENT_LLM_CALLS", "0")),
+            llm_requests_per_minute=int(getenv("AIAPI_LLM_REQUESTS_PER_MINUTE", "0")),
+            summary_cache_ttl=float(getenv("AIAPI_SUMMARY_CACHE_TTL", "0")),
+            llm_slot_lease=float(getenv("AIAPI_LLM_SLOT_LEASE", "600")),
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._connections.get()
+
+    def _create_schema(self) -> None:
+        connection = self._connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_slots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pid INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                started_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS llm_calls_started_at ON llm_calls (started_at);
+            CREATE TABLE IF NOT EXISTS summary_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+
+    @property
+    def limits_llm_calls(self) -> bool:
+        return self.max_concurrent_llm_calls > 0 or self.llm_requests_per_minute > 0
+
+    @property
+    def caches_summaries(self) -> bool:
+        return self.summary_cache_ttl > 0
+
+    def _try_acquire_llm_slot(self) -> tuple[int | None, float]:
+        """Returns the acquired slot ID, or None and the number of seconds to wait."""
+        connection = self._connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM llm_slots WHERE expires_at < ?", (now,))
+            connection.execute("DELETE FROM llm_calls WHERE started_at < ?", (now - RATE_WINDOW_SECONDS,))
+            if self.max_concurrent_llm_calls > 0:
+                (in_flight,) = connection.execute("SELECT COUNT(*) FROM llm_slots").fetchone()
+                if in_flight >= self.max_concurrent_llm_calls:
+                    connection.execute("COMMIT")
+                    return None, POLL_INTERVAL_SECONDS
+            if self.llm_requests_per_minute > 0:
+                (started, oldest) = connection.execute(
+                    "SELECT COUNT(*), MIN(started_at) FROM llm_calls"
+                ).fetchone()
+                if started >= self.llm_requests_per_minute:
+                    connection.execute("COMMIT")
+                    return None, oldest + RATE_WINDOW_SECONDS - now
+            slot_id = connection.execute(
+                "INSERT INTO llm_slots (pid, expires_at) VALUES (?, ?)",
+                (os.getpid(), now + self.llm_slot_lease),
+            ).lastrowid
+            connection.execute("INSERT INTO llm_calls (started_at) VALUES (?)", (now,))
+            connection.execute("COMMIT")
+            return slot_id, 0
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _release_llm_slot(self, slot_id: int) -> None:
+        self._connection().execute("DELETE FROM llm_slots WHERE id = ?", (slot_id,))
+
+    def _release_abandoned_llm_slot(self, attempt: asyncio.Future) -> None:
+        if attempt.cancelled() or attempt.exception() is not None:
+            return
+        slot_id, _ = attempt.result()
+        if slot_id is not None:
+            asyncio.get_running_loop().run_in_executor(None, self._release_llm_slot, slot_id)
+
+    async def _acquire_llm_slot(self) -> int:
+        while True:
+            # The worker thread commits the slot even if the caller is cancelled meanwhile,
+            # so a cancelled caller releases it once the attempt is done
+            attempt = asyncio.ensure_future(asyncio.to_thread(self._try_acquire_llm_slot))
+            try:
+                slot_id, wait = await asyncio.shield(attempt)
+            except asyncio.CancelledError:
+                attempt.add_done_callback(self._release_abandoned_llm_slot)
+                raise
+            if slot_id is not None:
+                return slot_id
+            await asyncio.sleep(min(max(wait, POLL_INTERVAL_SECONDS), MAX_POLL_INTERVAL_SECONDS))
+
+    @asynccontextmanager
+    async def llm_slot(self) -> AsyncIterator[None]:
+        """Waits until the shared concurrency and rate budget allow another LLM call."""
+        if not self.limits_llm_calls:
+            yield
+            return
+        slot_id = await self._acquire_llm_slot()
+        try:
+            yield
+        finally:
+            await asyncio.to_thread(self._release_llm_slot, slot_id)
+
+    def _get_cached_summary(self, key: str) -> str | None:
+        row = self._connection().execute(
+            "SELECT value FROM summary_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_cached_summary(self, key: str, value: str) -> None:
+        now = time.time()
+        connection = self._connection()
+        connection.execute("DELETE FROM summary_cache WHERE expires_at < ?", (now,))
+        connection.execute(
+            "INSERT OR REPLACE INTO summary_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + self.summary_cache_ttl),
+        )
+
+    async def get_cached_summary(self, key: str) -> str | None:
+        if not self.caches_summaries:
+            return None
+        return await asyncio.to_thread(self._get_cached_summary, key)
+
+    async def set_cached_summary(self, key: str, value: str) -> None:
+        if self.caches_summaries:
+            await asyncio.to_thread(self._set_cached_summary, key, value)
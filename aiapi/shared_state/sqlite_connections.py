@@ -0,0 +1,24 @@
+import sqlite3
+import threading
+
+
+class SqliteConnections:
+    """Hands out one connection per thread to a SQLite database in WAL mode.
+
+    Shared by everything that keeps state in SQLite, so timeouts and pragmas
+    are the same for all of them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from shared_state.shared_state import SharedState
+
+
+class SlowSharedState(SharedState):
+    """Takes long enough to acquire a slot that callers can be cancelled meanwhile."""
+
+    def _try_acquire_llm_slot(self) -> tuple[int | None, float]:
+        time.sleep(0.2)
+        return super()._try_acquire_llm_slot()
+
+
+class SharedStateTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shared-state.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _slot_count(self, shared_state: SharedState) -> int:
+        (count,) = shared_state._connection().execute("SELECT COUNT(*) FROM llm_slots").fetchone()
+        return count
+
+    async def test_llm_slot_is_released_after_the_call(self):
+        shared_state = SharedState(self.path, max_concurrent_llm_calls=1)
+        async with shared_state.llm_slot():
+            self.assertEqual(self._slot_count(shared_state), 1)
+        self.assertEqual(self._slot_count(shared_state), 0)
+
+    async def test_llm_slot_is_released_when_cancelled_while_acquiring(self):
+        shared_state = SlowSharedState(self.path, max_concurrent_llm_calls=1, llm_slot_lease=600)
+        entered = asyncio.Event()
+
+        async def call_llm():
+            async with shared_state.llm_slot():
+                entered.set()
+
+        caller = asyncio.create_task(call_llm())
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        self.assertFalse(entered.is_set())
+
+        # Without the release, the next caller would wait for the whole lease
+        await asyncio.wait_for(call_llm(), timeout=5)
+        self.assertTrue(entered.is_set())
+        self.assertEqual(self._slot_count(shared_state), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,224 @@
+import asyncio
 import os
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
 import httpx
+from pydantic import TypeAdapter
+
+from mcpserver_types import GIST_ADAPTER, GISTS_ADAPTER, GISTS_WITH_SIMILARITY_ADAPTER, RECAP_ADAPTER
 
 BACKEND_HOST = os.getenv("BACKEND_HOST", "http://backend:8080")
 BACKEND_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", "30"))
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "5"))
+BACKEND_POOL_TIMEOUT = float(os.getenv("BACKEND_POOL_TIMEOUT", "10"))
+BACKEND_MAX_CONNECTIONS = int(os.getenv("BACKEND_MAX_CONNECTIONS", "100"))
+BACKEND_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("BACKEND_MAX_KEEPALIVE_CONNECTIONS", "20"))
+BACKEND_KEEPALIVE_EXPIRY = float(os.getenv("BACKEND_KEEPALIVE_EXPIRY", "30"))
+BACKEND_HTTP2 = os.getenv("BACKEND_HTTP2", "false").lower() == "true"
+# Transient connection errors are retried with exponential backoff and full jitter
+BACKEND_RETRIES = int(os.getenv("BACKEND_RETRIES", "2"))
+BACKEND_RETRY_BACKOFF = float(os.getenv("BACKEND_RETRY_BACKOFF", "0.2"))
+# "once" validates each backend response against the schema when it is fetched,
+# "trust" forwards the parsed JSON as-is
+VALIDATE_RESPONSES = os.getenv("BACKEND_RESPONSE_VALIDATION", "once").lower() != "trust"
+
+# Cache lifetimes in seconds per endpoint, 0 disables caching for that endpoint
+CACHE_MAX_ENTRIES = int(os.getenv("BACKEND_CACHE_MAX_ENTRIES", "512"))
+CACHE_TTL_GISTS = float(os.getenv("BACKEND_CACHE_TTL_GISTS", "30"))
+CACHE_TTL_SEARCH = float(os.getenv("BACKEND_CACHE_TTL_SEARCH", "300"))
+CACHE_TTL_SIMILAR = float(os.getenv("BACKEND_CACHE_TTL_SIMILAR", "600"))
+CACHE_TTL_RECAP = float(os.getenv("BACKEND_CACHE_TTL_RECAP", "600"))
+
+# Errors where the request cannot have reached the backend or the connection broke
+# before a response arrived. Read timeouts are not retried to avoid piling load
+# onto a slow backend.
+_TRANSIENT_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+_client: httpx.AsyncClient | None = None
+_pool_metrics = {
+    "in_flight": 0,
+    "peak_in_flight": 0,
+    "requests": 0,
+    "retries": 0,
+    "pool_timeouts": 0,
+}
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=BACKEND_HOST,
+        http2=BACKEND_HTTP2,
+        timeout=httpx.Timeout(
+            BACKEND_TIMEOUT,
+            connect=BACKEND_CONNECT_TIMEOUT,
+            pool=BACKEND_POOL_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=BACKEND_MAX_CONNECTIONS,
+            max_keepalive_connections=BACKEND_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+
+@asynccontextmanager
+async def client_lifespan() -> AsyncIterator[None]:
+    """Opens the shared backend client for the lifetime of the server app and closes it on shutdown."""
+    global _client
+    if _client is not None:
+        # Close a client that was created on demand before the lifespan started
+        await _client.aclose()
+    _client = _create_client()
+    try:
+        yield
+    finally:
+        await _client.aclose()
+        _client = None
+
+
+def get_pool_metrics() -> dict:
+    return {
+        **_pool_metrics,
+        "max_connections": BACKEND_MAX_CONNECTIONS,
+        "saturation": _pool_metrics["in_flight"] / BACKEND_MAX_CONNECTIONS,
+    }
+
+
+async def _send_get(path: str, params: dict | None, headers: dict | None) -> httpx.Response:
+    _pool_metrics["requests"] += 1
+    for attempt in range(BACKEND_RETRIES + 1):
+        # Only count attempts, so requests waiting in backoff don't inflate the saturation
+        _pool_metrics["in_flight"] += 1
+        _pool_metrics["peak_in_flight"] = max(_pool_metrics["peak_in_flight"], _pool_metrics["in_flight"])
+        try:
+            return await _get_client().get(path, params=params, headers=headers)
+        except httpx.PoolTimeout:
+            _pool_metrics["pool_timeouts"] += 1
+            raise
+        except _TRANSIENT_ERRORS:
+            if attempt == BACKEND_RETRIES:
+                raise
+            _pool_metrics["retries"] += 1
+        finally:
+            _pool_metrics["in_flight"] -= 1
+        await asyncio.sleep(random.uniform(0, BACKEND_RETRY_BACKOFF * 2 ** attempt))
+
+
+@dataclass
+class _CacheEntry:
+    data: dict | list
+    etag: str | None
+    expires_at: float
+
+
+_cache: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+_in_flight: dict[tuple, asyncio.Task] = {}
+_cache_metrics = {
+    "hits": 0,
+    "misses": 0,
+    "revalidated": 0,
+    "coalesced": 0,
+    "evictions": 0,
+}
+
 
-_client = httpx.AsyncClient(base_url=BACKEND_HOST, timeout=BACKEND_TIMEOUT)
+def get_cache_metrics() -> dict:
+    return {**_cache_metrics, "entries": len(_cache), "in_flight": len(_in_flight)}
 
 
-async def _get(path: str, params: dict | None = None) -> dict | list:
-    response = await _client.get(path, params=params)
+def _cache_key(path: str, params: dict | None) -> tuple:
+    return path, tuple(sorted((params or {}).items()))
+
+
+def _store(key: tuple, entry: _CacheEntry) -> None:
+    _cache[key] = entry
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+        _cache_metrics["evictions"] += 1
+
+
+def _parse(response: httpx.Response, adapter: TypeAdapter | None) -> dict | list:
+    if adapter is None or not VALIDATE_RESPONSES:
+        return response.json()
+    return adapter.validate_json(response.content)
+
+
+async def _fetch(
+    key: tuple,
+    path: str,
+    params: dict | None,
+    ttl: float,
+    adapter: TypeAdapter | None,
+    stale: _CacheEntry | None,
+) -> dict | list:
+    headers = {"If-None-Match": stale.etag} if stale is not None and stale.etag else None
+    response = await _send_get(path, params, headers)
+    if response.status_code == 304 and stale is not None:
+        _cache_metrics["revalidated"] += 1
+        stale.expires_at = time.monotonic() + ttl
+        _store(key, stale)
+        return stale.data
     response.raise_for_status()
-    return response.json()
+    data = _parse(response, adapter)
+    if ttl > 0:
+        _store(key, _CacheEntry(data, response.headers.get("ETag"), time.monotonic() + ttl))
+    return data
+
+
+def _finish_in_flight(key: tuple, task: asyncio.Task) -> None:
+    _in_flight.pop(key, None)
+    # Mark the exception as retrieved in case every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def _get(
+    path: str,
+    params: dict | None = None,
+    ttl: float = 0,
+    adapter: TypeAdapter | None = None,
+) -> dict | list:
+    """GETs a backend endpoint, serving fresh responses from an in-process LRU cache.
+
+    Identical concurrent requests share a single backend call. Expired entries with
+    an ETag are revalidated with If-None-Match. Responses are parsed, and validated
+    with `adapter`, once per backend call so callers can forward them as-is.
+    Returned data is shared between callers and must not be mutated.
+    """
+    key = _cache_key(path, params)
+    entry = _cache.get(key)
+    if entry is not None and entry.expires_at > time.monotonic():
+        _cache.move_to_end(key)
+        _cache_metrics["hits"] += 1
+        return entry.data
+    task = _in_flight.get(key)
+    if task is not None:
+        _cache_metrics["coalesced"] += 1
+    else:
+        _cache_metrics["misses"] += 1
+        task = asyncio.ensure_future(_fetch(key, path, params, ttl, adapter, entry))
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _finish_in_flight(key, done))
+    return await asyncio.shield(task)
 
 
 async def get_gists(
@@ -26,7 +234,17 @@ async def get_gists(
         params["languageMode"] = language_mode
     if include_sponsored_content is not None:
         params["includeSponsoredContent"] = str(include_sponsored_content).lower()
-    return await _get("/api/v1/gists", params)
+    return await _get("/api/v1/gists", params, CACHE_TTL_GISTS, GISTS_ADAPTER)
+
+
+async def get_gist(
+    gist_id: int,
+    language_mode: str | None = None,
+) -> dict:
+    params: dict = {}
+    if language_mode is not None:
+        params["languageMode"] = language_mode
+    return await _get(f"/api/v1/gists/{gist_id}", params, CACHE_TTL_GISTS, GIST_ADAPTER)
 
 
 async def search_gists(
@@ -36,7 +254,7 @@ async def search_gists(
     params: dict = {"q": q}
     if language_mode is not None:
         params["languageMode"] = language_mode
-    return await _get("/api/v1/gists/search", params)
+    return await _get("/api/v1/gists/search", params, CACHE_TTL_SEARCH, GISTS_WITH_SIMILARITY_ADAPTER)
 
 
 async def get_similar_gists(
@@ -46,7 +264,9 @@ async def get_similar_gists(
     params: dict = {}
     if language_mode is not None:
         params["languageMode"] = language_mode
-    return await _get(f"/api/v1/gists/{gist_id}/similar", params)
+    return await _get(
+        f"/api/v1/gists/{gist_id}/similar", params, CACHE_TTL_SIMILAR, GISTS_WITH_SIMILARITY_ADAPTER
+    )
 
 
 async def get_recap(
@@ -55,4 +275,6 @@ async def get_recap(
     return await _get(
         f"/api/v1/gists/recap/{recap_type}",
         params={"languageMode": language_mode},
+        ttl=CACHE_TTL_RECAP,
+        adapter=RECAP_ADAPTER,
     )
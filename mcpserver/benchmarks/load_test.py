@@ -0,0 +1,287 @@
+"""Load test for the MCP server against a stub backend.
+
+Starts the stub backend and an instrumented MCP server in subprocesses, then
+drives the streamable-HTTP endpoint with simulated agent sessions calling a
+weighted mix of single, bulk and multi-page tools at varying detail levels
+with increasing concurrency. Reports calls/s, p50/p99 latency, server
+event-loop lag and memory per level and saves the results as JSON for
+regression comparison.
+
+Run from the mcpserver directory:
+
+    python -m benchmarks.load_test --concurrency 1 8 32 --output results.json
+    python -m benchmarks.load_test --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.stub_backend import NEWEST_GIST_ID
+
+# Relative weights of the tools a simulated agent calls
+TOOL_MIX = {
+    "get_gists": 25,
+    "search_gists": 20,
+    "get_similar_gists": 10,
+    "get_gist": 10,
+    "get_gists_by_ids": 8,
+    "get_gists_pages": 7,
+    "get_similar_gists_bulk": 5,
+    "search_gists_bulk": 5,
+    "get_daily_recap": 5,
+    "get_weekly_recap": 5,
+}
+# Relative weights of the detail levels requested from the gist tools
+DETAIL_LEVEL_MIX = {"ids_titles": 30, "brief": 40, "full": 30}
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    calls: int
+    errors: int
+    calls_per_second: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    loop_lag_p99_ms: float | None = None
+    loop_lag_max_ms: float | None = None
+    rss_mb: float | None = None
+    max_rss_mb: float | None = None
+    calls_by_tool: dict[str, int] = field(default_factory=dict)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))]
+
+
+def _pick(rng: random.Random, weights: dict[str, int]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _tool_call(rng: random.Random, distinct: int) -> tuple[str, dict]:
+    name = _pick(rng, TOOL_MIX)
+    if name in ("get_daily_recap", "get_weekly_recap"):
+        return name, {}
+    arguments = {"detail_level": _pick(rng, DETAIL_LEVEL_MIX)}
+    if name == "get_gists":
+        page = rng.randrange(distinct)
+        arguments.update(take=20, last_gist=NEWEST_GIST_ID - page * 20 if page else None)
+    elif name == "get_gists_pages":
+        page = rng.randrange(distinct)
+        arguments.update(pages=rng.randint(2, 5), take=20, last_gist=NEWEST_GIST_ID - page * 20 if page else None)
+    elif name == "search_gists":
+        arguments["q"] = f"benchmark query {rng.randrange(distinct)}"
+    elif name == "search_gists_bulk":
+        arguments["queries"] = [f"benchmark query {rng.randrange(distinct)}" for _ in range(rng.randint(2, 5))]
+    elif name in ("get_gists_by_ids", "get_similar_gists_bulk"):
+        arguments["gist_ids"] = [NEWEST_GIST_ID - rng.randrange(distinct) for _ in range(rng.randint(3, 10))]
+    else:
+        arguments["gist_id"] = NEWEST_GIST_ID - rng.randrange(distinct)
+    return name, arguments
+
+
+async def _simulated_client(
+    url: str,
+    deadline: float,
+    distinct: int,
+    seed: int,
+    latencies: list[float],
+    calls_by_tool: dict[str, int],
+) -> int:
+    rng = random.Random(seed)
+    errors = 0
+    async with streamablehttp_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            while time.perf_counter() < deadline:
+                name, arguments = _tool_call(rng, distinct)
+                started = time.perf_counter()
+                try:
+                    result = await session.call_tool(name, arguments)
+                    errors += result.isError
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+                calls_by_tool[name] = calls_by_tool.get(name, 0) + 1
+    return errors
+
+
+async def _server_stats(client: httpx.AsyncClient, base_url: str) -> dict:
+    try:
+        response = await client.get(f"{base_url}/benchmark/stats")
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError:
+        return {}
+
+
+async def _run_level(args: argparse.Namespace, base_url: str, concurrency: int) -> LevelResult:
+    latencies: list[float] = []
+    calls_by_tool: dict[str, int] = {}
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{base_url}/benchmark/reset")
+        started = time.perf_counter()
+        deadline = started + args.duration
+        errors = await asyncio.gather(*(
+            _simulated_client(f"{base_url}/mcp", deadline, args.distinct, seed, latencies, calls_by_tool)
+            for seed in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        stats = await _server_stats(client, base_url)
+    return LevelResult(
+        concurrency=concurrency,
+        calls=len(latencies),
+        errors=sum(errors),
+        calls_per_second=len(latencies) / elapsed,
+        latency_p50_ms=_percentile(latencies, 50) * 1000,
+        latency_p99_ms=_percentile(latencies, 99) * 1000,
+        loop_lag_p99_ms=stats.get("loop_lag_p99_ms"),
+        loop_lag_max_ms=stats.get("loop_lag_max_ms"),
+        rss_mb=stats.get("rss_mb"),
+        max_rss_mb=stats.get("max_rss_mb"),
+        calls_by_tool=calls_by_tool,
+    )
+
+
+async def _wait_until_healthy(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{url} did not become healthy within {timeout}s")
+            await asyncio.sleep(0.2)
+
+
+async def _start_processes(args: argparse.Namespace) -> list[asyncio.subprocess.Process]:
+    backend = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.stub_backend",
+        "--port", str(args.backend_port),
+        "--latency", str(args.backend_latency),
+        "--summary-words", str(args.summary_words),
+        "--search-results", str(args.search_results),
+        "--similar-results", str(args.similar_results),
+    )
+    env = {**os.environ, "BACKEND_HOST": f"http://127.0.0.1:{args.backend_port}"}
+    if args.disable_cache:
+        env.update({
+            f"BACKEND_CACHE_TTL_{endpoint}": "0"
+            for endpoint in ("GISTS", "SEARCH", "SIMILAR", "RECAP")
+        })
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.serve_mcp", "--port", str(args.server_port), env=env,
+    )
+    processes = [backend, server]
+    try:
+        await _wait_until_healthy(f"http://127.0.0.1:{args.backend_port}/api/v1/gists/recap/daily")
+        await _wait_until_healthy(f"http://127.0.0.1:{args.server_port}/health")
+    except BaseException:
+        await _stop_processes(processes)
+        raise
+    return processes
+
+
+async def _stop_processes(processes: list[asyncio.subprocess.Process]) -> None:
+    for process in processes:
+        if process.returncode is None:
+            process.terminate()
+    for process in processes:
+        await process.wait()
+
+
+def _change(value: float, baseline: float) -> str:
+    # A baseline level where no call completed has nothing to compare against
+    return f"{value / baseline - 1:+.1%}" if baseline else "n/a"
+
+
+def _print_result(result: LevelResult, baseline: dict | None) -> None:
+    line = (
+        f"c={result.concurrency:<4} calls={result.calls:<6} err={result.errors:<4} "
+        f"{result.calls_per_second:8.1f} calls/s  p50={result.latency_p50_ms:8.2f}ms  "
+        f"p99={result.latency_p99_ms:8.2f}ms"
+    )
+    if result.loop_lag_p99_ms is not None:
+        line += f"  loop_lag_p99={result.loop_lag_p99_ms:7.2f}ms  rss={result.rss_mb:6.1f}MB"
+    if baseline:
+        line += f"  vs baseline: {_change(result.calls_per_second, baseline['calls_per_second'])} calls/s, "
+        line += f"{_change(result.latency_p99_ms, baseline['latency_p99_ms'])} p99"
+    print(line)
+
+
+async def run(args: argparse.Namespace) -> list[LevelResult]:
+    baselines = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baselines = {level["concurrency"]: level for level in json.load(f)["levels"]}
+
+    processes = [] if args.server_url else await _start_processes(args)
+    base_url = args.server_url or f"http://127.0.0.1:{args.server_port}"
+    try:
+        results = []
+        for concurrency in args.concurrency:
+            result = await _run_level(args, base_url, concurrency)
+            _print_result(result, baselines.get(concurrency))
+            results.append(result)
+        return results
+    finally:
+        await _stop_processes(processes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for the MCP server against a stub backend")
+    parser.add_argument(
+        "--concurrency", nargs="+", type=int, default=[1, 4, 16, 64],
+        help="Numbers of concurrent simulated agent sessions, in order",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument(
+        "--distinct", type=int, default=200,
+        help="Distinct pages, queries and gist IDs the clients pick from (lower means more cache hits)",
+    )
+    parser.add_argument("--backend-latency", type=float, default=0.02, help="Stub backend latency in seconds")
+    parser.add_argument("--summary-words", type=int, default=60, help="Words per gist summary")
+    parser.add_argument("--search-results", type=int, default=20, help="Gists per search response")
+    parser.add_argument("--similar-results", type=int, default=5, help="Gists per similar gists response")
+    parser.add_argument("--disable-cache", action="store_true", help="Disable the backend response cache")
+    parser.add_argument("--backend-port", type=int, default=18080, help="Port for the stub backend")
+    parser.add_argument("--server-port", type=int, default=18000, help="Port for the MCP server")
+    parser.add_argument(
+        "--server-url",
+        help="Benchmark an already running server instead of starting one (e.g. http://127.0.0.1:8000)",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "settings": {
+                    key: value for key, value in vars(args).items()
+                    if key not in ("output", "compare", "server_url")
+                },
+                "levels": [asdict(result) for result in results],
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Micro-benchmark for converting backend responses into tool results.
+
+Compares the previous per-call path (parse JSON, build a Pydantic model per
+gist, dump it again) with validating the raw bytes straight to plain data via
+the TypedDict adapters the backend client uses and with forwarding the parsed
+JSON as-is. Reports CPU time and allocated memory
+per call.
+
+Run from the mcpserver directory:
+
+    python -m benchmarks.response_conversion --gists 100 --iterations 2000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from mcp.types import CallToolResult
+
+from benchmarks.stub_backend import make_gist
+from mcpserver_types import ConstructedGist, GISTS_ADAPTER, GistsResponse
+
+
+def _per_gist_models(raw: bytes) -> CallToolResult:
+    result = json.loads(raw)
+    response = GistsResponse(gists=[ConstructedGist(**g) for g in result])
+    return CallToolResult(content=[], structuredContent=response.model_dump())
+
+
+def _validate_once(raw: bytes) -> CallToolResult:
+    return CallToolResult(content=[], structuredContent={"gists": GISTS_ADAPTER.validate_json(raw)})
+
+
+def _trust(raw: bytes) -> CallToolResult:
+    return CallToolResult(content=[], structuredContent={"gists": json.loads(raw)})
+
+
+def _measure(convert: Callable[[bytes], CallToolResult], raw: bytes, iterations: int) -> tuple[float, float]:
+    convert(raw)
+    started = time.process_time()
+    for _ in range(iterations):
+        convert(raw)
+    cpu_us = (time.process_time() - started) / iterations * 1_000_000
+
+    tracemalloc.start()
+    for _ in range(min(iterations, 100)):
+        convert(raw)
+    allocated_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return cpu_us, allocated_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark for tool response conversion")
+    parser.add_argument("--gists", type=int, default=100, help="Gists per backend response")
+    parser.add_argument("--iterations", type=int, default=2000, help="Conversions per variant")
+    args = parser.parse_args()
+
+    raw = json.dumps([make_gist(i) for i in range(args.gists)]).encode()
+    variants = {
+        "per-gist models": _per_gist_models,
+        "validate once": _validate_once,
+        "trust": _trust,
+    }
+    baseline = None
+    for name, convert in variants.items():
+        cpu_us, allocated_kb = _measure(convert, raw, args.iterations)
+        baseline = baseline or cpu_us
+        print(f"{name:<16} {cpu_us:9.1f}us/call ({baseline / cpu_us:4.1f}x)  peak alloc {allocated_kb:8.1f}KB")
+    print("Cached responses skip the conversion entirely.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""MCP server instrumented for load tests.
+
+Runs the regular streamable-HTTP app and additionally samples event-loop lag
+and memory. GET /benchmark/stats returns the samples since the last
+POST /benchmark/reset.
+
+    BACKEND_HOST=http://127.0.0.1:18080 python -m benchmarks.serve_mcp --port 18000
+"""
+import argparse
+import asyncio
+import logging
+import resource
+import time
+from contextlib import asynccontextmanager
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+import backend_client
+from server import create_app
+
+LAG_SAMPLE_INTERVAL = 0.01
+
+_lag_samples: list[float] = []
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))]
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / (1024 * 1024)
+
+
+async def _sample_loop_lag() -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        _lag_samples.append(time.perf_counter() - started - LAG_SAMPLE_INTERVAL)
+
+
+async def stats(request: Request) -> Response:
+    return JSONResponse({
+        "loop_lag_p50_ms": _percentile(_lag_samples, 50) * 1000,
+        "loop_lag_p99_ms": _percentile(_lag_samples, 99) * 1000,
+        "loop_lag_max_ms": max(_lag_samples, default=0) * 1000,
+        "rss_mb": _rss_mb(),
+        # ru_maxrss is reported in kilobytes on Linux
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "backend_cache": backend_client.get_cache_metrics(),
+        "backend_pool": backend_client.get_pool_metrics(),
+    })
+
+
+async def reset(request: Request) -> Response:
+    _lag_samples.clear()
+    return JSONResponse({"status": "ok"})
+
+
+def create_benchmark_app() -> Starlette:
+    app = create_app()
+    server_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        sampler = asyncio.create_task(_sample_loop_lag())
+        try:
+            async with server_lifespan(app):
+                yield
+        finally:
+            sampler.cancel()
+
+    app.router.lifespan_context = lifespan
+    app.add_route("/benchmark/stats", stats, methods=["GET"])
+    app.add_route("/benchmark/reset", reset, methods=["POST"])
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Instrumented MCP server for load tests")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=18000, help="Port to listen on")
+    args = parser.parse_args()
+
+    # FastMCP logs every request at INFO, which would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+    uvicorn.run(create_benchmark_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Stub of the backend gists API for benchmarking the MCP server.
+
+Serves realistic /api/v1/gists, /search, /similar, /{id} and /recap payloads
+with a configurable latency and payload size.
+
+    python -m benchmarks.stub_backend --port 18080 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+SUMMARY_SENTENCE = "A realistic sentence of an AI-generated summary of an IT security news article. "
+NEWEST_GIST_ID = 100_000
+
+
+def make_gist(gist_id: int, summary_words: int = 60) -> dict:
+    sentence_words = len(SUMMARY_SENTENCE.split())
+    return {
+        "id": gist_id,
+        "reference": f"reference-{gist_id}",
+        "feedTitle": "Benchmark Feed",
+        "feedUrl": "https://example.com/feed.xml",
+        "feedType": 0,
+        "title": f"Benchmark gist {gist_id}",
+        "author": "Benchmark Author",
+        "isSponsoredContent": False,
+        "url": f"https://example.com/articles/{gist_id}",
+        "published": "2026-01-01T00:00:00Z",
+        "updated": "2026-01-01T00:00:00Z",
+        "summary": (SUMMARY_SENTENCE * max(summary_words // sentence_words, 1)).strip(),
+        "tags": ["ransomware", "vulnerability", "patch management"],
+    }
+
+
+def make_recap(recap_id: int, sections: int = 6) -> dict:
+    return {
+        "created": "2026-01-01T05:00:00Z",
+        "id": recap_id,
+        "recapSections": [
+            {
+                "heading": f"Benchmark section {section}",
+                "recap": SUMMARY_SENTENCE * 3,
+                "related": [
+                    {"id": gist_id, "title": f"Benchmark gist {gist_id}"}
+                    for gist_id in range(section * 5, section * 5 + 5)
+                ],
+            }
+            for section in range(sections)
+        ],
+    }
+
+
+def create_app(latency: float, summary_words: int, search_results: int, similar_results: int) -> Starlette:
+    async def respond(data: dict | list) -> Response:
+        if latency:
+            await asyncio.sleep(latency)
+        return Response(json.dumps(data), media_type="application/json")
+
+    async def get_gists(request: Request) -> Response:
+        take = int(request.query_params.get("take", 20))
+        last_gist = int(request.query_params.get("lastGist", NEWEST_GIST_ID + 1))
+        first_id = min(last_gist, NEWEST_GIST_ID + 1) - 1
+        return await respond([make_gist(i, summary_words) for i in range(first_id, max(first_id - take, 0), -1)])
+
+    async def search_gists(request: Request) -> Response:
+        seed = sum(request.query_params.get("q", "").encode()) % NEWEST_GIST_ID
+        return await respond([
+            {"gist": make_gist(seed - i, summary_words), "similarity": 0.9 - i / 100}
+            for i in range(search_results)
+        ])
+
+    async def get_gist(request: Request) -> Response:
+        return await respond(make_gist(request.path_params["id"], summary_words))
+
+    async def get_similar_gists(request: Request) -> Response:
+        gist_id = request.path_params["id"]
+        return await respond([
+            {"gist": make_gist(gist_id - i - 1, summary_words), "similarity": 0.8 - i / 100}
+            for i in range(similar_results)
+        ])
+
+    async def get_recap(request: Request) -> Response:
+        return await respond(make_recap(1 if request.path_params["recap_type"] == "daily" else 2))
+
+    return Starlette(routes=[
+        Route("/api/v1/gists", get_gists),
+        Route("/api/v1/gists/search", search_gists),
+        Route("/api/v1/gists/recap/{recap_type}", get_recap),
+        Route("/api/v1/gists/{id:int}", get_gist),
+        Route("/api/v1/gists/{id:int}/similar", get_similar_gists),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub backend for MCP server benchmarks")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=18080, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.02, help="Response latency in seconds")
+    parser.add_argument("--summary-words", type=int, default=60, help="Words per gist summary")
+    parser.add_argument("--search-results", type=int, default=20, help="Gists per search response")
+    parser.add_argument("--similar-results", type=int, default=5, help="Gists per similar gists response")
+    args = parser.parse_args()
+
+    app = create_app(args.latency, args.summary_words, args.search_results, args.similar_results)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import argparse
 
-from server import mcp
+import uvicorn
+
+from server import create_app, mcp
 
 
 def main() -> None:
@@ -9,9 +11,12 @@ def main() -> None:
     parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
     args = parser.parse_args()
 
-    mcp.settings.host = args.host
-    mcp.settings.port = args.port
-    mcp.run(transport="streamable-http")
+    uvicorn.run(
+        create_app(),
+        host=args.host,
+        port=args.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class ConstructedGist(BaseModel):
@@ -17,6 +20,28 @@ class ConstructedGist(BaseModel):
     tags: list[str] = Field(description="AI-assigned topic tags (e.g. 'ransomware', 'vulnerability').")
 
 
+class GistIdTitle(BaseModel):
+    id: int
+    title: str = Field(description="Title of the original article.")
+
+
+class BriefGist(GistIdTitle):
+    feedTitle: str = Field(description="Name of the RSS feed this article came from.")
+    url: str = Field(description="URL of the original full-text article.")
+    published: str = Field(description="ISO 8601 publication timestamp.")
+    tags: list[str] = Field(description="AI-assigned topic tags (e.g. 'ransomware', 'vulnerability').")
+
+
+DetailLevel = Literal["ids_titles", "brief", "full"]
+
+# Gist fields returned per detail level, None returns the full ConstructedGist
+GIST_FIELDS_BY_DETAIL_LEVEL: dict[str, tuple[str, ...] | None] = {
+    "ids_titles": tuple(GistIdTitle.model_fields),
+    "brief": tuple(BriefGist.model_fields),
+    "full": None,
+}
+
+
 class GistWithSimilarity(BaseModel):
     gist: ConstructedGist
     similarity: float = Field(description="Cosine similarity score (0.0–1.0). Higher means more relevant.")
@@ -45,3 +70,50 @@ class GistsResponse(BaseModel):
 
 class GistsWithSimilarityResponse(BaseModel):
     gists: list[GistWithSimilarity]
+
+
+# Plain-data mirrors of the models above. Validating against these yields dicts
+# and lists that are forwarded as-is, without building and dumping models.
+class GistData(TypedDict):
+    id: int
+    reference: str
+    feedTitle: str
+    feedUrl: str
+    feedType: int
+    title: str
+    author: str
+    isSponsoredContent: bool
+    url: str
+    published: str
+    updated: str
+    summary: str
+    tags: list[str]
+
+
+class GistWithSimilarityData(TypedDict):
+    gist: GistData
+    similarity: float
+
+
+class RelatedGistInfoData(TypedDict):
+    id: int
+    title: str
+
+
+class RecapSectionData(TypedDict):
+    heading: str
+    recap: str
+    related: list[RelatedGistInfoData]
+
+
+class RecapData(TypedDict):
+    created: str
+    recapSections: list[RecapSectionData]
+    id: int
+
+
+# Validators for raw backend responses, see backend_client.VALIDATE_RESPONSES
+GIST_ADAPTER = TypeAdapter(GistData)
+GISTS_ADAPTER = TypeAdapter(list[GistData])
+GISTS_WITH_SIMILARITY_ADAPTER = TypeAdapter(list[GistWithSimilarityData])
+RECAP_ADAPTER = TypeAdapter(RecapData)
@@ -1,33 +1,75 @@
-from typing import Literal
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Literal
 
 import httpx
 from mcp.server.fastmcp import FastMCP
 from mcp.types import CallToolResult, TextContent
-from pydantic import BaseModel
+from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 
 import backend_client
-from mcpserver_types import (
-    ConstructedGist,
-    DeserializedRecap,
-    GistsResponse,
-    GistsWithSimilarityResponse,
-    GistWithSimilarity,
-)
+from mcpserver_types import GIST_FIELDS_BY_DETAIL_LEVEL, DetailLevel
+
+# Upper bounds for the bulk tools, so a single tool call cannot flood the backend
+BULK_CONCURRENCY = int(os.getenv("MCP_BULK_CONCURRENCY", "8"))
+BULK_MAX_ITEMS = int(os.getenv("MCP_BULK_MAX_ITEMS", "25"))
+MAX_PAGES = int(os.getenv("MCP_MAX_PAGES", "10"))
+
+
+def _structured_response(content: dict) -> CallToolResult:
+    # backend_client already parsed and validated the backend JSON, so it is
+    # forwarded without another round trip through the Pydantic models
+    return CallToolResult(content=[], structuredContent=content)
+
+
+def _project_gist(gist: dict, detail_level: DetailLevel) -> dict:
+    fields = GIST_FIELDS_BY_DETAIL_LEVEL[detail_level]
+    if fields is None:
+        return gist
+    return {field: gist[field] for field in fields if field in gist}
 
 
-def _structured_response(model: BaseModel) -> CallToolResult:
-    return CallToolResult(content=[], structuredContent=model.model_dump())
+def _project_gists(gists: list, detail_level: DetailLevel) -> list:
+    return [_project_gist(gist, detail_level) for gist in gists]
 
 
-def _error_response(err: Exception) -> CallToolResult:
+def _project_gists_with_similarity(gists: list, detail_level: DetailLevel) -> list:
+    return [
+        {"gist": _project_gist(g["gist"], detail_level), "similarity": g["similarity"]}
+        for g in gists
+    ]
+
+
+def _error_message(err: Exception) -> str:
     if isinstance(err, httpx.HTTPStatusError):
-        msg = f"Backend returned {err.response.status_code}: {err.response.text}"
-    else:
-        msg = f"Backend request failed: {err}"
+        return f"Backend returned {err.response.status_code}: {err.response.text}"
+    return f"Backend request failed: {err}"
+
+
+def _error_response(err: Exception | str) -> CallToolResult:
+    msg = err if isinstance(err, str) else _error_message(err)
     return CallToolResult(content=[TextContent(type="text", text=msg)], isError=True)
 
+
+async def _gather_bounded(calls: list[Callable[[], Awaitable]]) -> list:
+    """Runs the backend calls concurrently, at most BULK_CONCURRENCY at a time.
+
+    Failed calls return their exception instead of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def run(call: Callable[[], Awaitable]):
+        async with semaphore:
+            try:
+                return await call()
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                return e
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
 mcp = FastMCP(
     "The Gist of IT-Sec",
     host="0.0.0.0",
@@ -49,12 +91,39 @@ async def health_check(request: Request) -> Response:
     return JSONResponse({"status": "ok"})
 
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> Response:
+    return JSONResponse({
+        "backend_cache": backend_client.get_cache_metrics(),
+        "backend_pool": backend_client.get_pool_metrics(),
+    })
+
+
+def create_app() -> Starlette:
+    """Builds the streamable-HTTP app and ties the backend client to its lifespan.
+
+    FastMCP's own lifespan runs once per session, i.e. once per request in stateless
+    mode, so the shared client is managed by the Starlette app lifespan instead.
+    """
+    app = mcp.streamable_http_app()
+    session_manager_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        async with backend_client.client_lifespan(), session_manager_lifespan(app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
 @mcp.tool()
 async def get_gists(
     take: int = 20,
     last_gist: int | None = None,
     language_mode: Literal["En", "De", "Original"] = "Original",
     include_sponsored_content: bool | None = None,
+    detail_level: DetailLevel = "full",
 ) -> CallToolResult:
     """Browse the latest AI-summarised IT security news articles and blog posts.
 
@@ -67,6 +136,7 @@ async def get_gists(
         last_gist: ID of the last gist from the previous page (for pagination).
         language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
         include_sponsored_content: Whether to include vendor-sponsored content.
+        detail_level: How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
     """
     try:
         result = await backend_client.get_gists(
@@ -75,8 +145,7 @@ async def get_gists(
             language_mode=language_mode,
             include_sponsored_content=include_sponsored_content,
         )
-        response = GistsResponse(gists=[ConstructedGist(**g) for g in result])
-        return _structured_response(response)
+        return _structured_response({"gists": _project_gists(result, detail_level)})
     except (httpx.HTTPStatusError, httpx.RequestError) as e:
         return _error_response(e)
 
@@ -85,6 +154,7 @@ async def get_gists(
 async def search_gists(
     q: str,
     language_mode: Literal["En", "De", "Original"] = "Original",
+    detail_level: DetailLevel = "full",
 ) -> CallToolResult:
     """Search IT security gists by meaning using vector similarity.
 
@@ -95,14 +165,14 @@ async def search_gists(
     Args:
         q: Natural-language search query.
         language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
+        detail_level: How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
     """
     try:
         result = await backend_client.search_gists(
             q=q,
             language_mode=language_mode,
         )
-        response = GistsWithSimilarityResponse(gists=[GistWithSimilarity(**g) for g in result])
-        return _structured_response(response)
+        return _structured_response({"gists": _project_gists_with_similarity(result, detail_level)})
     except (httpx.HTTPStatusError, httpx.RequestError) as e:
         return _error_response(e)
 
@@ -111,6 +181,7 @@ async def search_gists(
 async def get_similar_gists(
     gist_id: int,
     language_mode: Literal["En", "De", "Original"] = "Original",
+    detail_level: DetailLevel = "full",
 ) -> CallToolResult:
     """Find gists covering similar topics to a given gist.
 
@@ -120,15 +191,178 @@ async def get_similar_gists(
     Args:
         gist_id: The numeric ID of the reference gist.
         language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
+        detail_level: How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
     """
     try:
         result = await backend_client.get_similar_gists(
             gist_id, language_mode=language_mode
         )
-        response = GistsWithSimilarityResponse(gists=[GistWithSimilarity(**g) for g in result])
-        return _structured_response(response)
+        return _structured_response({"gists": _project_gists_with_similarity(result, detail_level)})
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        return _error_response(e)
+
+
+@mcp.tool()
+async def get_gist(
+    gist_id: int,
+    language_mode: Literal["En", "De", "Original"] = "Original",
+) -> CallToolResult:
+    """Get the full details of a single gist by its ID.
+
+    Returns the complete gist including the AI-generated summary, source feed,
+    author, tags and a link to the full text. Use this after scanning gists with a
+    compact detail_level to read the ones that matter.
+
+    Args:
+        gist_id: The numeric ID of the gist.
+        language_mode: Language for the AI summary: "En" (English), "De" (German), or "Original" (language of the source article).
+    """
+    try:
+        result = await backend_client.get_gist(gist_id, language_mode=language_mode)
+        return _structured_response(result)
+    except (httpx.HTTPStatusError, httpx.RequestError) as e:
+        return _error_response(e)
+
+
+@mcp.tool()
+async def get_gists_by_ids(
+    gist_ids: list[int],
+    language_mode: Literal["En", "De", "Original"] = "Original",
+    detail_level: DetailLevel = "full",
+) -> CallToolResult:
+    """Get several gists by their IDs in a single call.
+
+    The gists are fetched concurrently. Results keep the order of the requested
+    IDs; IDs that could not be fetched carry an error instead of a gist.
+
+    Args:
+        gist_ids: Numeric IDs of the gists (at most 25).
+        language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
+        detail_level: How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
+    """
+    gist_ids = list(dict.fromkeys(gist_ids))
+    if len(gist_ids) > BULK_MAX_ITEMS:
+        return _error_response(f"At most {BULK_MAX_ITEMS} gist IDs can be requested at once")
+    results = await _gather_bounded([
+        lambda gist_id=gist_id: backend_client.get_gist(gist_id, language_mode=language_mode)
+        for gist_id in gist_ids
+    ])
+    return _structured_response({"results": [
+        {"gist_id": gist_id, "error": _error_message(result)} if isinstance(result, Exception)
+        else {"gist_id": gist_id, "gist": _project_gist(result, detail_level)}
+        for gist_id, result in zip(gist_ids, results)
+    ]})
+
+
+@mcp.tool()
+async def get_similar_gists_bulk(
+    gist_ids: list[int],
+    language_mode: Literal["En", "De", "Original"] = "Original",
+    detail_level: DetailLevel = "brief",
+) -> CallToolResult:
+    """Find similar gists for several reference gists in a single call.
+
+    Runs get_similar_gists for every ID concurrently. Results keep the order of the
+    requested IDs; IDs that could not be looked up carry an error instead of gists.
+
+    Args:
+        gist_ids: Numeric IDs of the reference gists (at most 25).
+        language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
+        detail_level: Defaults to "brief". How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
+    """
+    gist_ids = list(dict.fromkeys(gist_ids))
+    if len(gist_ids) > BULK_MAX_ITEMS:
+        return _error_response(f"At most {BULK_MAX_ITEMS} gist IDs can be requested at once")
+    results = await _gather_bounded([
+        lambda gist_id=gist_id: backend_client.get_similar_gists(gist_id, language_mode=language_mode)
+        for gist_id in gist_ids
+    ])
+    return _structured_response({"results": [
+        {"gist_id": gist_id, "error": _error_message(result)} if isinstance(result, Exception)
+        else {"gist_id": gist_id, "gists": _project_gists_with_similarity(result, detail_level)}
+        for gist_id, result in zip(gist_ids, results)
+    ]})
+
+
+@mcp.tool()
+async def search_gists_bulk(
+    queries: list[str],
+    language_mode: Literal["En", "De", "Original"] = "Original",
+    detail_level: DetailLevel = "brief",
+) -> CallToolResult:
+    """Run several semantic searches in a single call.
+
+    Runs search_gists for every query concurrently. Results keep the order of the
+    queries; queries that failed carry an error instead of gists.
+
+    Args:
+        queries: Natural-language search queries (at most 25).
+        language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
+        detail_level: Defaults to "brief". How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
+    """
+    queries = list(dict.fromkeys(queries))
+    if len(queries) > BULK_MAX_ITEMS:
+        return _error_response(f"At most {BULK_MAX_ITEMS} queries can be requested at once")
+    results = await _gather_bounded([
+        lambda q=q: backend_client.search_gists(q=q, language_mode=language_mode)
+        for q in queries
+    ])
+    return _structured_response({"results": [
+        {"query": q, "error": _error_message(result)} if isinstance(result, Exception)
+        else {"query": q, "gists": _project_gists_with_similarity(result, detail_level)}
+        for q, result in zip(queries, results)
+    ]})
+
+
+@mcp.tool()
+async def get_gists_pages(
+    pages: int = 3,
+    take: int = 20,
+    last_gist: int | None = None,
+    language_mode: Literal["En", "De", "Original"] = "Original",
+    include_sponsored_content: bool | None = None,
+    detail_level: DetailLevel = "brief",
+) -> CallToolResult:
+    """Browse several pages of the latest gists in a single call.
+
+    Follows the pagination cursor of get_gists for up to `pages` pages and returns
+    the merged, deduplicated gists newest-first. Pass `next_last_gist` from the
+    result as `last_gist` to continue browsing.
+
+    Args:
+        pages: Number of pages to fetch (at most 10).
+        take: Number of gists per page (default 20).
+        last_gist: ID of the last gist already seen (for pagination).
+        language_mode: Language for the AI summaries: "En" (English), "De" (German), or "Original" (language of the source article).
+        include_sponsored_content: Whether to include vendor-sponsored content.
+        detail_level: Defaults to "brief". How much of each gist to return: "ids_titles" (ID and title only), "brief" (ID, title, feed, URL, publication date and tags) or "full" (everything including the summary). Use a compact level to scan many gists and get_gist for the details of the few you need.
+    """
+    if pages < 1 or take < 1:
+        return _error_response("pages and take must be at least 1")
+    if pages > MAX_PAGES:
+        return _error_response(f"At most {MAX_PAGES} pages can be requested at once")
+    gists: list[dict] = []
+    seen_ids: set[int] = set()
+    cursor = last_gist
+    try:
+        for _ in range(pages):
+            result = await backend_client.get_gists(
+                take=take,
+                last_gist=cursor,
+                language_mode=language_mode,
+                include_sponsored_content=include_sponsored_content,
+            )
+            for gist in result:
+                if gist["id"] not in seen_ids:
+                    seen_ids.add(gist["id"])
+                    gists.append(_project_gist(gist, detail_level))
+            if not result or len(result) < take:
+                cursor = None
+                break
+            cursor = result[-1]["id"]
     except (httpx.HTTPStatusError, httpx.RequestError) as e:
         return _error_response(e)
+    return _structured_response({"gists": gists, "next_last_gist": cursor})
 
 
 @mcp.tool()
@@ -143,8 +377,7 @@ async def get_daily_recap(language_mode: Literal["En", "De"] = "En") -> CallTool
     """
     try:
         result = await backend_client.get_recap("daily", language_mode)
-        response = DeserializedRecap(**result)
-        return _structured_response(response)
+        return _structured_response(result)
     except (httpx.HTTPStatusError, httpx.RequestError) as e:
         return _error_response(e)
 
@@ -161,7 +394,6 @@ async def get_weekly_recap(language_mode: Literal["En", "De"] = "En") -> CallToo
     """
     try:
         result = await backend_client.get_recap("weekly", language_mode)
-        response = DeserializedRecap(**result)
-        return _structured_response(response)
+        return _structured_response(result)
     except (httpx.HTTPStatusError, httpx.RequestError) as e:
         return _error_response(e)